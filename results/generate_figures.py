@@ -8,10 +8,21 @@ Requirements:
     pip install matplotlib seaborn numpy pandas
 """
 
+import hashlib
+import inspect
+import matplotlib
+matplotlib.use('Agg')  # Headless backend; figures are only written to disk
+matplotlib.interactive(False)
 import matplotlib.pyplot as plt
 import numpy as np
+from numpy.polynomial import polynomial as P
+from matplotlib.collections import PatchCollection
+from matplotlib.patches import Rectangle
+import multiprocessing
 import os
 
+plt.ioff()  # Safety net in case pyplot was already imported interactively
+
 # Set publication-quality defaults
 plt.rcParams['figure.dpi'] = 300
 plt.rcParams['savefig.dpi'] = 300
@@ -23,6 +34,70 @@ plt.rcParams['font.serif'] = ['Times New Roman']
 FIGURES_DIR = os.path.join(os.path.dirname(__file__), 'figures')
 os.makedirs(FIGURES_DIR, exist_ok=True)
 
+# Bar palettes sampled once for the five floor plan types
+_VIRIDIS5 = plt.cm.viridis(np.linspace(0.3, 0.9, 5))
+_PLASMA5 = plt.cm.plasma(np.linspace(0.3, 0.9, 5))
+
+# Single figure reused by every chart instead of building a new one each time
+_FIG = plt.figure(figsize=(10, 5))
+
+
+def _reset_figure(figsize, nrows=1, ncols=1):
+    """Clear the shared figure, resize it and return fresh axes"""
+    _FIG.clear()
+    _FIG.set_size_inches(*figsize)
+    return _FIG.subplots(nrows, ncols)
+
+
+def _save_figure(filename):
+    """Lay out and save the shared figure into FIGURES_DIR"""
+    _FIG.tight_layout()
+    _FIG.savefig(os.path.join(FIGURES_DIR, filename))
+
+
+def _data_key(chart_fn, data):
+    """Hash a chart's data, drawing code, rcParams and matplotlib version into a cache key"""
+    parts = (
+        repr(data),
+        inspect.getsource(chart_fn),
+        inspect.getsource(_reset_figure),
+        inspect.getsource(_save_figure),
+        repr(sorted(plt.rcParams.items())),
+        matplotlib.__version__,
+    )
+    return hashlib.md5('\0'.join(parts).encode()).hexdigest()
+
+
+def _is_cached(filename, key):
+    """Check whether filename was already rendered with this key"""
+    png_path = os.path.join(FIGURES_DIR, filename)
+    key_path = png_path + '.key'
+    if not (os.path.exists(png_path) and os.path.exists(key_path)):
+        return False
+    with open(key_path) as f:
+        return f.read().strip() == key
+
+
+def _write_cache_key(filename, key):
+    """Record the cache key next to a freshly saved figure"""
+    with open(os.path.join(FIGURES_DIR, filename) + '.key', 'w') as f:
+        f.write(key)
+
+
+def _bar_collection(ax, labels, values, colors, width=0.8):
+    """Draw a categorical bar chart as one PatchCollection and return bar centers"""
+    x = np.arange(len(values))
+    patches = [Rectangle((i - width/2, 0), width, v) for i, v in zip(x, values)]
+    collection = PatchCollection(patches, facecolors=colors,
+                                 edgecolors='black', linewidths=0.8)
+    collection.sticky_edges.y.append(0)  # Bars start at 0 like ax.bar
+    ax.add_collection(collection)
+    ax.set_xticks(x)
+    ax.set_xticklabels(labels)
+    ax.autoscale_view()
+    return x
+
+
 def create_performance_chart():
     """Create performance benchmarking chart (Table I visualization)"""
     print("Generating performance chart...")
@@ -32,11 +107,11 @@ def create_performance_chart():
     rooms = [2, 4, 7, 9, 12]
     times = [3.2, 4.1, 4.6, 5.8, 7.3]
     
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
+    ax1, ax2 = _reset_figure((10, 4), 1, 2)
     
     # Processing time chart
-    colors = plt.cm.viridis(np.linspace(0.3, 0.9, len(floor_plans)))
-    bars = ax1.bar(floor_plans, times, color=colors, edgecolor='black', linewidth=0.8)
+    colors = _VIRIDIS5
+    x = _bar_collection(ax1, floor_plans, times, colors)
     ax1.set_ylabel('Processing Time (ms)', fontsize=11, fontweight='bold')
     ax1.set_xlabel('Floor Plan Type', fontsize=11, fontweight='bold')
     ax1.set_title('(a) Processing Time Analysis', fontsize=12, fontweight='bold')
@@ -44,19 +119,16 @@ def create_performance_chart():
     ax1.set_ylim(0, 10)
     
     # Add value labels on bars
-    for bar, time in zip(bars, times):
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width()/2., height,
-                f'{time:.1f}ms', ha='center', va='bottom', fontsize=9)
+    for xi, time in zip(x, times):
+        ax1.text(xi, time, f'{time:.1f}ms', ha='center', va='bottom', fontsize=9)
     
     # Wall count vs time scatter plot
     ax2.scatter(walls, times, s=100, c=colors, edgecolor='black', linewidth=0.8, zorder=3)
     
     # Add trend line
-    z = np.polyfit(walls, times, 1)
-    p = np.poly1d(z)
+    coef = P.polyfit(walls, times, 1)
     x_line = np.linspace(0, 40, 100)
-    ax2.plot(x_line, p(x_line), "r--", alpha=0.7, linewidth=2, label='Linear fit')
+    ax2.plot(x_line, P.polyval(x_line, coef), "r--", alpha=0.7, linewidth=2, label='Linear fit')
     
     ax2.set_xlabel('Number of Walls', fontsize=11, fontweight='bold')
     ax2.set_ylabel('Processing Time (ms)', fontsize=11, fontweight='bold')
@@ -64,9 +136,7 @@ def create_performance_chart():
     ax2.grid(alpha=0.3, linestyle='--')
     ax2.legend(fontsize=9)
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, 'performance_analysis.png'), bbox_inches='tight')
-    plt.close()
+    _save_figure('performance_analysis.png')
     print(f"  ✓ Saved: {FIGURES_DIR}/performance_analysis.png")
 
 
@@ -78,9 +148,11 @@ def create_file_size_chart():
     walls = [5, 12, 18, 24, 35]
     file_sizes = [12.4, 18.7, 24.3, 31.5, 42.8]  # KB
     
-    fig, ax = plt.subplots(figsize=(7, 4))
+    ax = _reset_figure((7, 4))
     
-    colors = plt.cm.plasma(np.linspace(0.3, 0.9, len(floor_plans)))
+    # Plain bars here: legend placement ('best') only avoids Patch artists,
+    # not a PatchCollection, and five bars cost nothing to draw
+    colors = _PLASMA5
     bars = ax.bar(floor_plans, file_sizes, color=colors, edgecolor='black', linewidth=0.8)
     
     ax.set_ylabel('File Size (KB)', fontsize=11, fontweight='bold')
@@ -90,15 +162,9 @@ def create_file_size_chart():
     ax.axhline(y=50, color='red', linestyle='--', linewidth=1.5, alpha=0.7, label='50 KB threshold')
     ax.legend(fontsize=9)
     
-    # Add value labels
-    for bar, size in zip(bars, file_sizes):
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-                f'{size:.1f}', ha='center', va='bottom', fontsize=9)
+    ax.bar_label(bars, fmt='%.1f', fontsize=9)
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, 'file_size_analysis.png'), bbox_inches='tight')
-    plt.close()
+    _save_figure('file_size_analysis.png')
     print(f"  ✓ Saved: {FIGURES_DIR}/file_size_analysis.png")
 
 
@@ -111,7 +177,7 @@ def create_accuracy_chart():
     output_vals = [5.002, 0.100, 2.500, 15.98]
     errors = [0.04, 0.00, 0.00, 0.13]  # percent
     
-    fig, ax = plt.subplots(figsize=(8, 5))
+    ax = _reset_figure((8, 5))
     
     x = np.arange(len(dimensions))
     width = 0.35
@@ -134,9 +200,7 @@ def create_accuracy_chart():
         ax.text(i, max(inp, out) + 0.5, f'Error: {err:.2f}%', 
                 ha='center', fontsize=8, style='italic', color='darkred')
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, 'accuracy_validation.png'), bbox_inches='tight')
-    plt.close()
+    _save_figure('accuracy_validation.png')
     print(f"  ✓ Saved: {FIGURES_DIR}/accuracy_validation.png")
 
 
@@ -148,7 +212,13 @@ def create_room_color_distribution():
     counts = [3, 1, 2, 1, 1, 1, 1, 2]  # Example distribution
     colors_pie = ['#ffcccc', '#ffff99', '#b3e0ff', '#d9ffd9', '#f2e6c7', '#f2f2f2', '#e6ffff', '#e6e6e6']
     
-    fig, ax = plt.subplots(figsize=(7, 7))
+    # Skip re-rendering if the PNG is up to date with this data and code
+    key = _data_key(create_room_color_distribution, (room_types, counts, colors_pie))
+    if _is_cached('room_distribution.png', key):
+        print("  ✓ Cached: room_distribution.png")
+        return
+    
+    ax = _reset_figure((7, 7))
     
     wedges, texts, autotexts = ax.pie(counts, labels=room_types, colors=colors_pie,
                                         autopct='%1.1f%%', startangle=90,
@@ -162,9 +232,8 @@ def create_room_color_distribution():
     
     ax.set_title('Room Type Distribution in Test Dataset', fontsize=12, fontweight='bold', pad=20)
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, 'room_distribution.png'), bbox_inches='tight')
-    plt.close()
+    _save_figure('room_distribution.png')
+    _write_cache_key('room_distribution.png', key)
     print(f"  ✓ Saved: {FIGURES_DIR}/room_distribution.png")
 
 
@@ -172,9 +241,6 @@ def create_system_architecture_placeholder():
     """Create a simple architecture diagram placeholder"""
     print("Generating architecture diagram placeholder...")
     
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.axis('off')
-    
     # Architecture layers
     layers = [
         ('Input Layer', 'JSON Floor Plan\nRoom Metadata\nUser Config', 'lightblue'),
@@ -186,6 +252,15 @@ def create_system_architecture_placeholder():
     
     y_positions = [0.85, 0.68, 0.48, 0.28, 0.10]
     
+    # Skip re-rendering if the PNG is up to date with this data and code
+    key = _data_key(create_system_architecture_placeholder, (layers, y_positions))
+    if _is_cached('architecture_diagram.png', key):
+        print("  ✓ Cached: architecture_diagram.png")
+        return
+    
+    ax = _reset_figure((10, 6))
+    ax.axis('off')
+    
     for (title, content, color), y_pos in zip(layers, y_positions):
         # Draw rectangle
         rect = plt.Rectangle((0.05, y_pos-0.06), 0.9, 0.12, 
@@ -211,9 +286,8 @@ def create_system_architecture_placeholder():
     ax.set_title('System Architecture and Data Flow Pipeline', 
                 fontsize=14, fontweight='bold', pad=20)
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, 'architecture_diagram.png'), bbox_inches='tight')
-    plt.close()
+    _save_figure('architecture_diagram.png')
+    _write_cache_key('architecture_diagram.png', key)
     print(f"  ✓ Saved: {FIGURES_DIR}/architecture_diagram.png")
 
 
@@ -225,7 +299,7 @@ def create_test_coverage_chart():
     lines = [467, 528, 107]
     coverage = [100, 85, 100]  # percentage
     
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
+    ax1, ax2 = _reset_figure((10, 4), 1, 2)
     
     # Lines of code
     colors = ['steelblue', 'coral', 'mediumseagreen']
@@ -234,10 +308,8 @@ def create_test_coverage_chart():
     ax1.set_title('(a) Code Size Distribution', fontsize=12, fontweight='bold')
     ax1.grid(axis='x', alpha=0.3, linestyle='--')
     
-    for bar, line_count in zip(bars1, lines):
-        width = bar.get_width()
-        ax1.text(width, bar.get_y() + bar.get_height()/2.,
-                f'{line_count}', ha='left', va='center', fontsize=9, fontweight='bold')
+    ax1.bar_label(bars1, labels=[f'{line_count}' for line_count in lines],
+                  fontsize=9, fontweight='bold')
     
     # Test coverage
     bars2 = ax2.barh(modules, coverage, color=colors, edgecolor='black', linewidth=0.8)
@@ -247,17 +319,28 @@ def create_test_coverage_chart():
     ax2.grid(axis='x', alpha=0.3, linestyle='--')
     ax2.axvline(x=100, color='green', linestyle='--', linewidth=1.5, alpha=0.7)
     
-    for bar, cov in zip(bars2, coverage):
-        width = bar.get_width()
-        ax2.text(width + 2, bar.get_y() + bar.get_height()/2.,
-                f'{cov}%', ha='left', va='center', fontsize=9, fontweight='bold')
+    ax2.bar_label(bars2, labels=[f'{cov}%' for cov in coverage], padding=5,
+                  fontsize=9, fontweight='bold')
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(FIGURES_DIR, 'test_coverage.png'), bbox_inches='tight')
-    plt.close()
+    _save_figure('test_coverage.png')
     print(f"  ✓ Saved: {FIGURES_DIR}/test_coverage.png")
 
 
+CHART_FUNCTIONS = [
+    create_performance_chart,
+    create_file_size_chart,
+    create_accuracy_chart,
+    create_room_color_distribution,
+    create_system_architecture_placeholder,
+    create_test_coverage_chart,
+]
+
+
+def _run_chart(chart_fn):
+    """Pool worker: render one chart (module-level so it can be pickled)"""
+    chart_fn()
+
+
 def main():
     """Generate all figures for the report"""
     print("=" * 60)
@@ -266,12 +349,10 @@ def main():
     print()
     
     try:
-        create_performance_chart()
-        create_file_size_chart()
-        create_accuracy_chart()
-        create_room_color_distribution()
-        create_system_architecture_placeholder()
-        create_test_coverage_chart()
+        # Charts are independent, so render them in parallel processes
+        processes = min(len(CHART_FUNCTIONS), os.cpu_count() or 1)
+        with multiprocessing.Pool(processes=processes) as pool:
+            pool.map(_run_chart, CHART_FUNCTIONS)
         
         print()
         print("=" * 60)
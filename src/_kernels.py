@@ -0,0 +1,57 @@
+"""
+Numba Kernels for the Geometry Engine
+
+JIT-compiled loops used by builder.py for very large floor plans. Numba is
+an optional dependency: builder.py imports this module lazily and falls
+back to its NumPy implementation when the import fails.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True, parallel=True, fastmath=True)
+def wall_corners(walls: np.ndarray, half_thickness: float, corners: np.ndarray) -> int:
+    """
+    Compute the rectangular footprint of every wall segment in parallel.
+
+    Args:
+        walls: Array of shape (N, 2, 2) with the [x, y] endpoints of N walls
+        half_thickness: Half of the wall thickness
+        corners: Output array of shape (N, 4, 2), filled with the
+                 counter-clockwise corners of each footprint
+
+    Returns:
+        Number of zero-length walls (their corners are zeroed)
+    """
+    zero_length = 0
+
+    for i in prange(walls.shape[0]):
+        x0 = walls[i, 0, 0]
+        y0 = walls[i, 0, 1]
+        x1 = walls[i, 1, 0]
+        y1 = walls[i, 1, 1]
+
+        dx = x1 - x0
+        dy = y1 - y0
+        length = np.sqrt(dx * dx + dy * dy)
+
+        if length == 0:
+            zero_length += 1
+            corners[i, :, :] = 0.0
+            continue
+
+        # Left-hand unit normal scaled to half the wall thickness
+        nx = -dy / length * half_thickness
+        ny = dx / length * half_thickness
+
+        corners[i, 0, 0] = x0 - nx
+        corners[i, 0, 1] = y0 - ny
+        corners[i, 1, 0] = x1 - nx
+        corners[i, 1, 1] = y1 - ny
+        corners[i, 2, 0] = x1 + nx
+        corners[i, 2, 1] = y1 + ny
+        corners[i, 3, 0] = x0 + nx
+        corners[i, 3, 1] = y0 + ny
+
+    return zero_length
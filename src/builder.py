@@ -8,11 +8,18 @@ Author: Senior Python Engineer
 Purpose: Production-ready 3D model generation from vector floor plans
 """
 
-from typing import Dict, List, Tuple, Any, Optional
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple, Any, Optional
+import functools
 import numpy as np
-import trimesh
-from shapely.geometry import LineString, Polygon
-from shapely.ops import unary_union
+
+# trimesh and Shapely are slow to import and only needed for geometry, so
+# they are imported inside the methods that use them. Metadata-only users
+# (room parsing, summaries, colors) never pay for them.
+if TYPE_CHECKING:
+    import trimesh
+    from shapely.geometry import Polygon
 
 
 # Default color palette for different room types (RGB format, normalized 0-1)
@@ -37,6 +44,98 @@ DEFAULT_ROOM_COLORS = {
     "default": (0.9, 0.9, 0.9)            # Default gray
 }
 
+# Triangle indices for a rectangular prism whose vertices 0-3 are the bottom
+# corners (counter-clockwise) and 4-7 the matching top corners. Winding gives
+# outward-facing normals on every side.
+_PRISM_FACES = np.array([
+    [0, 2, 1], [0, 3, 2],  # Bottom
+    [4, 5, 6], [4, 6, 7],  # Top
+    [0, 1, 5], [0, 5, 4],  # Sides
+    [1, 2, 6], [1, 6, 5],
+    [2, 3, 7], [2, 7, 6],
+    [3, 0, 4], [3, 4, 7]
+], dtype=np.int32)
+
+# Most distinct room types each RoomColorManager memoizes
+_COLOR_CACHE_SIZE = 128
+
+# Plans with at least this many wall segments compute their footprints with
+# the parallel Numba kernel in _kernels.py when Numba is installed. Below it
+# the NumPy expression is faster than the JIT dispatch and thread startup.
+_NUMBA_MIN_WALLS = 10_000
+
+# Largest face buffer (in walls) kept between calls, about 2.4 MB. Bigger
+# plans build their faces for that call only.
+_FACE_BUF_MAX_WALLS = 16_384
+
+# Face indices shared by every builder, grown by _prism_faces
+_FACE_BUF = np.empty((0, 12, 3), dtype=np.int32)
+
+
+def _numba_wall_corners():
+    """Return the Numba footprint kernel, or None if Numba is not installed."""
+    try:
+        from _kernels import wall_corners
+    except ImportError:
+        return None
+    return wall_corners
+
+
+def _prism_faces(n_walls: int) -> np.ndarray:
+    """
+    Return the face indices for n_walls consecutive 8-vertex prisms.
+    
+    The faces of the first n walls do not depend on the plan, so one
+    module-level buffer is shared by all builders and sliced on later calls.
+    It grows by doubling when a larger plan comes in, up to
+    _FACE_BUF_MAX_WALLS walls, and is read-only, since trimesh copies it
+    into its own int64 array anyway.
+    
+    Args:
+        n_walls: Number of walls in the mesh
+        
+    Returns:
+        Read-only array of shape (n_walls, 12, 3)
+    """
+    global _FACE_BUF
+    
+    # Read the global once; a concurrent grow only swaps in a larger buffer
+    buf = _FACE_BUF
+    if len(buf) >= n_walls:
+        return buf[:n_walls]
+    
+    size = max(min(2 * len(buf), _FACE_BUF_MAX_WALLS), n_walls)
+    faces = np.empty((size, 12, 3), dtype=np.int32)
+    np.add(_PRISM_FACES[None, :, :], 8 * np.arange(size, dtype=np.int32)[:, None, None], out=faces)
+    faces.flags.writeable = False
+    
+    # Oversized plans get a one-off buffer so a single huge upload does
+    # not stay pinned in the process
+    if size <= _FACE_BUF_MAX_WALLS:
+        _FACE_BUF = faces
+    
+    return faces[:n_walls]
+
+
+def _to_color_255(color: Tuple[float, float, float]) -> np.ndarray:
+    """Convert a normalized RGB tuple to the uint8 (0-255) form trimesh stores."""
+    return (np.asarray(color, dtype=np.float64) * 255).astype(np.uint8)
+
+
+def _is_wall_index(value: Any, n_walls: int) -> bool:
+    """
+    Check whether a room_walls entry names one of the n_walls walls.
+    
+    Integral floats (e.g., 1.0 from float-emitting tools) count as indices;
+    strings, fractional numbers and out-of-range values never match a wall.
+    """
+    if isinstance(value, (float, np.floating)):
+        if not value.is_integer():
+            return False
+    elif not isinstance(value, (int, np.integer)):
+        return False
+    return 0 <= value < n_walls
+
 
 class RoomColorManager:
     """
@@ -57,6 +156,18 @@ class RoomColorManager:
         self.colors = DEFAULT_ROOM_COLORS.copy()
         if custom_colors:
             self.colors.update(custom_colors)
+        self._rebuild_index()
+    
+    def _rebuild_index(self) -> None:
+        """Precompute the space-separated palette keys and reset the lookup cache."""
+        self._space_keys: List[Tuple[str, str]] = [
+            (key.replace("_", " "), key) for key in self.colors
+        ]
+        # Room types come straight from uploaded plans, so the memo is an
+        # LRU bounded to _COLOR_CACHE_SIZE entries rather than a plain dict
+        self._cached_color: Callable[[str], Tuple[float, float, float]] = (
+            functools.lru_cache(maxsize=_COLOR_CACHE_SIZE)(self._lookup_color)
+        )
     
     def get_color(self, room_type: str) -> Tuple[float, float, float]:
         """
@@ -68,6 +179,10 @@ class RoomColorManager:
         Returns:
             Tuple of (r, g, b) normalized to 0-1
         """
+        return self._cached_color(room_type)
+    
+    def _lookup_color(self, room_type: str) -> Tuple[float, float, float]:
+        """Resolve a room type against the palette without the cache."""
         # Normalize room type to lowercase
         room_type_normalized = room_type.lower().strip()
         
@@ -76,8 +191,8 @@ class RoomColorManager:
             return self.colors[room_type_normalized]
         
         # Check for partial matches (e.g., "Master Bedroom" -> "master_bedroom")
-        for key in self.colors:
-            if key.replace("_", " ") in room_type_normalized or room_type_normalized in key:
+        for space_key, key in self._space_keys:
+            if space_key in room_type_normalized or room_type_normalized in key:
                 return self.colors[key]
         
         # Return default color if no match found
@@ -91,6 +206,7 @@ class RoomColorManager:
             custom_colors: Dictionary of {room_type: (r, g, b)}
         """
         self.colors.update(custom_colors)
+        self._rebuild_index()
     
     def get_all_colors(self) -> Dict[str, Tuple[float, float, float]]:
         """Get all available room type colors."""
@@ -142,8 +258,9 @@ class HouseBuilder:
         """
         Convert a wall line segment into a 2D polygon with thickness.
         
-        This method uses Shapely's buffer operation to add thickness to a line,
-        creating a rectangular polygon that represents the wall's footprint.
+        The footprint is the same rectangle a flat-capped Shapely buffer of
+        the line would give, but its corners are computed directly by
+        _create_wall_polygons_batch instead of running GEOS's buffer.
         
         Args:
             wall_coords: A list of two [x, y] coordinate pairs defining the wall line
@@ -152,32 +269,79 @@ class HouseBuilder:
             A Shapely Polygon representing the wall's 2D footprint
             
         Raises:
-            ValueError: If wall_coords doesn't contain exactly 2 points
+            ValueError: If wall_coords doesn't contain exactly 2 points or has zero length
         """
         if len(wall_coords) != 2:
             raise ValueError(
                 f"Wall must have exactly 2 points, got {len(wall_coords)}"
             )
         
-        # Create a LineString from the two points
-        line = LineString(wall_coords)
+        from shapely.geometry import Polygon
         
-        # Buffer the line to give it thickness (cap_style=2 creates flat ends)
-        # This transforms the 1D line into a 2D rectangular polygon
-        wall_polygon = line.buffer(
-            self.wall_thickness / 2, 
-            cap_style=2,  # Flat caps
-            join_style=2  # Mitered joins
-        )
+        corners = self._create_wall_polygons_batch(np.asarray([wall_coords]))
         
-        return wall_polygon
-    
+        return Polygon(corners[0])
+
+    def _create_wall_polygons_batch(self, walls: np.ndarray) -> np.ndarray:
+        """
+        Compute the rectangular footprints of many wall segments at once.
+
+        A flat-capped buffer of a line segment is an oriented rectangle, so
+        the four corners can be computed directly from the segment direction
+        and its normal without going through Shapely for every wall.
+
+        Args:
+            walls: Array of shape (N, 2, 2) holding the [x, y] endpoints of N walls
+
+        Returns:
+            Array of shape (N, 4, 2) with the corners of each wall footprint,
+            in counter-clockwise order
+
+        Raises:
+            ValueError: If walls has the wrong shape or contains zero-length walls
+        """
+        # float32 matches the precision GLB stores vertex positions in
+        walls = np.asarray(walls, dtype=np.float32)
+        if walls.ndim != 3 or walls.shape[1:] != (2, 2):
+            raise ValueError(
+                f"Walls must have shape (N, 2, 2), got {walls.shape}"
+            )
+
+        half_thickness = self.wall_thickness / 2
+        
+        kernel = _numba_wall_corners() if len(walls) >= _NUMBA_MIN_WALLS else None
+        if kernel is not None:
+            corners = np.empty((len(walls), 4, 2), dtype=np.float32)
+            if kernel(walls, half_thickness, corners) == 0:
+                return corners
+            # Fall through to the NumPy path to report the zero-length walls
+
+        # Direction and length of every wall segment
+        d = walls[:, 1] - walls[:, 0]
+        lengths = np.linalg.norm(d, axis=1, keepdims=True)
+        if np.any(lengths == 0):
+            bad = np.flatnonzero(lengths[:, 0] == 0).tolist()
+            raise ValueError(f"Walls {bad} have zero length")
+
+        # Left-hand unit normals scaled to half the wall thickness
+        n = np.stack([-d[:, 1], d[:, 0]], axis=1) / lengths * half_thickness
+
+        corners = np.stack([
+            walls[:, 0] - n,
+            walls[:, 1] - n,
+            walls[:, 1] + n,
+            walls[:, 0] + n
+        ], axis=1)
+
+        return corners
+
     def _extrude_wall(self, wall_polygon: Polygon, color: Optional[Tuple[float, float, float]] = None) -> trimesh.Trimesh:
         """
         Extrude a 2D wall polygon into a 3D mesh with optional color.
         
-        Uses trimesh's extrusion functionality to create a vertical wall
-        from a 2D footprint polygon.
+        Rectangular footprints (what _create_wall_polygon produces) are built
+        directly as an 8-vertex, 12-face prism. Any other polygon falls back
+        to trimesh's general extrusion, which triangulates the footprint.
         
         Args:
             wall_polygon: A Shapely Polygon representing the wall's footprint
@@ -186,46 +350,121 @@ class HouseBuilder:
         Returns:
             A trimesh.Trimesh object representing the 3D wall
         """
-        # Extract exterior coordinates from the polygon
-        coords = np.array(wall_polygon.exterior.coords[:-1])  # Remove duplicate last point
+        import shapely
+        
+        exterior = wall_polygon.exterior
         
-        # Create a trimesh polygon and extrude it vertically
+        # Read the ring straight from GEOS as an array instead of iterating
+        # the Python coordinate sequence
+        ring = shapely.get_coordinates(exterior)
+        
+        if len(ring) == 5 and not wall_polygon.interiors:
+            # Drop the closing point and orient counter-clockwise for the prism faces
+            corners = ring[:-1]
+            if not exterior.is_ccw:
+                corners = corners[::-1]
+            
+            color_255 = None if color is None else _to_color_255(color)
+            return self._extrude_walls_batch(corners[None], color_255)
+        
+        import trimesh
+        
+        # Extrude the footprint vertically
         wall_mesh = trimesh.creation.extrude_polygon(
-            polygon=Polygon(coords),
+            polygon=wall_polygon,
             height=self.wall_height
         )
         
         # Apply color if provided
         if color is not None:
             # Convert RGB tuple to 0-255 range for trimesh
-            color_255 = tuple(int(c * 255) for c in color)
-            wall_mesh.visual.vertex_colors = color_255
+            wall_mesh.visual.vertex_colors = _to_color_255(color)
         
         return wall_mesh
     
-    def _get_wall_color(self, wall_idx: int, room_wall_mapping: Dict[str, List[int]]) -> Optional[Tuple[float, float, float]]:
+    def _extrude_walls_batch(
+        self,
+        corners: np.ndarray,
+        color_255: Optional[np.ndarray] = None
+    ) -> trimesh.Trimesh:
+        """
+        Extrude many rectangular wall footprints into a single 3D mesh.
+
+        Every wall is a rectangular prism, so its 8 vertices and 12 faces are
+        built analytically from the footprint corners instead of running a
+        general polygon triangulation per wall.
+
+        Args:
+            corners: Array of shape (N, 4, 2) with counter-clockwise footprint corners
+            color_255: Optional uint8 RGB color (0-255) shared by all N walls
+
+        Returns:
+            A trimesh.Trimesh containing all N walls
+        """
+        import trimesh
+
+        n_walls = corners.shape[0]
+
+        # Fill one preallocated (N, 8, 3) block: vertices 0-3 are the bottom
+        # ring at z=0, vertices 4-7 the top ring at the wall height
+        vertices = np.empty((n_walls, 8, 3), dtype=np.float32)
+        vertices[:, :4, :2] = corners
+        vertices[:, 4:, :2] = corners
+        vertices[:, :4, 2] = 0.0
+        vertices[:, 4:, 2] = self.wall_height
+
+        # The shared face template offset by each wall's first vertex index
+        faces = _prism_faces(n_walls)
+
+        # process=False keeps the 8-vertices-per-wall layout intact; merging
+        # coincident corners of neighbouring walls would mix their colors
+        walls_mesh = trimesh.Trimesh(
+            vertices=vertices.reshape(-1, 3),
+            faces=faces.reshape(-1, 3),
+            process=False
+        )
+
+        if color_255 is not None:
+            # Tile the opaque RGBA color over every vertex
+            rgba = np.append(color_255, np.uint8(255))
+            walls_mesh.visual.vertex_colors = np.tile(rgba, (8 * n_walls, 1))
+
+        return walls_mesh
+
+    def _wall_color_table(self, n_walls: int, room_wall_mapping: Dict[str, List[int]]) -> np.ndarray:
         """
-        Get the color for a wall based on room assignment.
+        Build the color of every wall from the room-to-walls assignment.
+        
+        The table is filled once per room instead of scanning every room for
+        every wall. A wall listed under several rooms takes the color of the
+        first room (in mapping order) that has metadata; unassigned walls get
+        the default color.
         
         Args:
-            wall_idx: Index of the wall
+            n_walls: Number of wall entries in the floor plan
             room_wall_mapping: Dictionary mapping room IDs to wall indices
             
         Returns:
-            RGB color tuple or None if wall is not assigned to a room
-        """
-        # Find which room this wall belongs to
-        for room_id, wall_indices in room_wall_mapping.items():
-            if wall_idx in wall_indices:
-                # Get room info
-                if room_id in self.room_metadata:
-                    room_type = self.room_metadata[room_id].get("type", "default")
-                    return self.color_manager.get_color(room_type)
-        
-        # Default color if not assigned to any room
-        return self.color_manager.get_color("default")
+            Array of shape (n_walls, 3) with uint8 RGB colors (0-255)
+        """
+        table = np.tile(_to_color_255(self.color_manager.get_color("default")), (n_walls, 1))
+        
+        # Assign in reverse so earlier rooms overwrite later ones
+        for room_id, wall_indices in reversed(list(room_wall_mapping.items())):
+            if room_id not in self.room_metadata:
+                continue
+            
+            indices = np.fromiter(
+                (int(i) for i in wall_indices if _is_wall_index(i, n_walls)),
+                dtype=np.int64
+            )
+            
+            room_type = self.room_metadata[room_id].get("type", "default")
+            table[indices] = _to_color_255(self.color_manager.get_color(room_type))
+        
+        return table
     
-    def _create_floor(self, wall_polygons: List[Polygon]) -> trimesh.Trimesh:
+    def _create_floor(self, corners: np.ndarray) -> trimesh.Trimesh:
         """
         Generate a floor plane that encompasses all walls.
         
@@ -233,14 +472,17 @@ class HouseBuilder:
         with a small margin for aesthetic purposes.
         
         Args:
-            wall_polygons: List of Shapely Polygons representing all wall footprints
+            corners: Array of shape (N, 4, 2) with the corners of all wall footprints
             
         Returns:
             A trimesh.Trimesh object representing the floor plane
         """
-        # Compute the union of all wall polygons to get overall bounds
-        union_poly = unary_union(wall_polygons)
-        minx, miny, maxx, maxy = union_poly.bounds
+        import trimesh
+        
+        # The footprints are rectangles, so their corner extremes are the overall bounds
+        flat_corners = corners.reshape(-1, 2)
+        minx, miny = flat_corners.min(axis=0)
+        maxx, maxy = flat_corners.max(axis=0)
         
         # Add a margin around the walls for better visualization
         margin = 0.5
@@ -249,21 +491,107 @@ class HouseBuilder:
             [maxx + margin, miny - margin, self.floor_offset],
             [maxx + margin, maxy + margin, self.floor_offset],
             [minx - margin, maxy + margin, self.floor_offset]
-        ])
+        ], dtype=np.float32)
         
         # Define two triangular faces to create a rectangular floor
         floor_faces = np.array([
             [0, 1, 2],  # First triangle
             [0, 2, 3]   # Second triangle
-        ])
+        ], dtype=np.int32)
         
+        # The quad is already clean, so skip trimesh's merge/cleanup pass
         floor_mesh = trimesh.Trimesh(
             vertices=floor_vertices, 
-            faces=floor_faces
+            faces=floor_faces,
+            process=False
         )
         
         return floor_mesh
     
+    def _wall_segments(self, walls_data: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Validate wall entries and flatten them into 2-point segments.
+
+        Plain [[x1, y1], [x2, y2]] walls are converted and shape-checked as a
+        single array. Plans that also use [label, coords] entries or
+        polylines with more than 2 points are split segment by segment.
+
+        Args:
+            walls_data: The "walls" list from the floor plan JSON
+
+        Returns:
+            Tuple of (segments, segment_walls) where segments has shape
+            (M, 2, 2) and segment_walls[i] is the index of the wall entry
+            that segment i came from
+
+        Raises:
+            ValueError: If a wall has fewer than 2 points or invalid or
+                        non-finite coordinates
+        """
+        # Fast path: every wall is already a 2-point segment
+        try:
+            walls_arr = np.asarray(walls_data, dtype=np.float64)
+        except (ValueError, TypeError):
+            walls_arr = None
+
+        if walls_arr is not None and walls_arr.ndim == 3 and walls_arr.shape[1:] == (2, 2):
+            self._check_finite(walls_arr, np.arange(len(walls_arr)))
+            return walls_arr, np.arange(len(walls_arr))
+
+        segment_blocks: List[np.ndarray] = []
+        wall_blocks: List[np.ndarray] = []
+
+        for idx, wall_data in enumerate(walls_data):
+            # Extract wall coordinates (handle both [label, coords] and direct coords formats)
+            if isinstance(wall_data, list) and len(wall_data) == 2 and isinstance(wall_data[0], str):
+                # Format: [label, coords]
+                wall_coords = wall_data[1]
+            else:
+                # Direct coords format
+                wall_coords = wall_data
+
+            try:
+                points = np.asarray(wall_coords, dtype=np.float64)
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"Wall {idx} has invalid coordinates {wall_coords}: {str(e)}")
+
+            if points.ndim != 2 or points.shape[1] != 2:
+                raise ValueError(
+                    f"Wall {idx} points must be [x, y] pairs, got {wall_coords}"
+                )
+
+            if len(points) < 2:
+                raise ValueError(
+                    f"Wall {idx} must have at least 2 points, got {len(points)}: {wall_coords}"
+                )
+
+            # Longer lists are polylines (e.g., outer perimeter) split into
+            # consecutive segments, built as one (K-1, 2, 2) block per wall
+            segment_blocks.append(np.stack([points[:-1], points[1:]], axis=1))
+            wall_blocks.append(np.full(len(points) - 1, idx))
+
+        segments = np.concatenate(segment_blocks)
+        segment_walls = np.concatenate(wall_blocks)
+        self._check_finite(segments, segment_walls)
+
+        return segments, segment_walls
+
+    def _check_finite(self, segments: np.ndarray, segment_walls: np.ndarray) -> None:
+        """
+        Reject wall segments with NaN or infinite coordinates.
+
+        Args:
+            segments: Array of shape (M, 2, 2) with the segment endpoints
+            segment_walls: Index of the wall entry each segment came from
+
+        Raises:
+            ValueError: If any coordinate is not finite
+        """
+        finite = np.isfinite(segments).all(axis=(1, 2))
+        if not finite.all():
+            bad = np.unique(segment_walls[~finite]).tolist()
+            raise ValueError(f"Walls {bad} have non-finite coordinates")
+
     def process_floorplan(self, json_data: Dict[str, Any], use_room_colors: bool = True) -> trimesh.Scene:
         """
         Convert a JSON floor plan specification into a 3D mesh scene.
@@ -281,7 +609,9 @@ class HouseBuilder:
             use_room_colors: If True, apply colors based on room types (default: True)
         
         Returns:
-            A trimesh.Scene containing all 3D meshes (walls + floor)
+            A trimesh.Scene with one merged wall mesh per distinct wall color
+            ("walls_0", "walls_1", ...; a single "walls" mesh when room colors
+            are disabled) plus a "floor" mesh
             
         Raises:
             ValueError: If json_data is missing "walls" key or has invalid structure
@@ -299,73 +629,54 @@ class HouseBuilder:
         if not isinstance(walls_data, list) or len(walls_data) == 0:
             raise ValueError("'walls' must be a non-empty list")
         
-        # Step 1: Convert all wall lines into 2D polygons with thickness
-        wall_polygons: List[Polygon] = []
-        wall_meshes: List[trimesh.Trimesh] = []
-        wall_colors: List[Optional[Tuple[float, float, float]]] = []
-        
         # Build room-to-walls mapping if room coloring is enabled
         room_wall_mapping: Dict[str, List[int]] = {}
         if use_room_colors and "room_walls" in json_data:
             room_wall_mapping = json_data["room_walls"]
-        
-        for idx, wall_data in enumerate(walls_data):
-            try:
-                # Extract wall coordinates (handle both [label, coords] and direct coords formats)
-                if isinstance(wall_data, list) and len(wall_data) == 2 and isinstance(wall_data[0], str):
-                    # Format: [label, coords]
-                    wall_coords = wall_data[1]
-                else:
-                    # Direct coords format
-                    wall_coords = wall_data
-                
-                # Determine color for this wall based on room assignment
-                wall_color = None
-                if use_room_colors:
-                    wall_color = self._get_wall_color(idx, room_wall_mapping)
-                
-                if len(wall_coords) == 2:
-                    # Single wall segment
-                    wall_polygon = self._create_wall_polygon(wall_coords)
-                    wall_polygons.append(wall_polygon)
-                    wall_mesh = self._extrude_wall(wall_polygon, wall_color)
-                    wall_meshes.append(wall_mesh)
-                    wall_colors.append(wall_color)
-                else:
-                    # Multiple segments for closed polygon (e.g., outer perimeter)
-                    for i in range(len(wall_coords) - 1):
-                        segment_coords = [wall_coords[i], wall_coords[i+1]]
-                        wall_polygon = self._create_wall_polygon(segment_coords)
-                        wall_polygons.append(wall_polygon)
-                        wall_mesh = self._extrude_wall(wall_polygon, wall_color)
-                        wall_meshes.append(wall_mesh)
-                        wall_colors.append(wall_color)
-                
-            except Exception as e:
-                raise Exception(
-                    f"Error processing wall {idx} with coords {wall_coords}: {str(e)}"
-                )
-        
-        # Step 2: Create the floor mesh
-        floor_mesh = self._create_floor(wall_polygons)
-        
-        # Step 3: Combine all meshes into a single scene
-        scene = trimesh.Scene()
-        
-        # Add all wall meshes
-        for idx, mesh in enumerate(wall_meshes):
-            scene.add_geometry(
-                mesh, 
-                node_name=f"wall_{idx}",
-                geom_name=f"wall_{idx}"
+
+        # Step 1: Validate walls and flatten them into 2-point segments
+        segments, segment_walls = self._wall_segments(walls_data)
+
+        # Determine colors per input wall, then broadcast them to its segments
+        segment_colors: Optional[np.ndarray] = None
+        if use_room_colors:
+            wall_colors = self._wall_color_table(len(walls_data), room_wall_mapping)
+            segment_colors = wall_colors[segment_walls]
+
+        # Step 2: Compute all wall footprints in one vectorized pass
+        corners = self._create_wall_polygons_batch(segments)
+
+        # Group walls by color, ordered by first appearance. Each group is
+        # merged into a single mesh so the GLB carries one geometry per room
+        # color instead of one per wall.
+        if segment_colors is None:
+            groups = [np.arange(len(segments))]
+        else:
+            unique_colors, first, inverse = np.unique(
+                segment_colors, axis=0, return_index=True, return_inverse=True
             )
+            inverse = inverse.reshape(-1)
+            groups = [np.flatnonzero(inverse == k) for k in np.argsort(first)]
+
+        geometry: Dict[str, trimesh.Trimesh] = {}
+        for group_idx, group in enumerate(groups):
+            group_color = None if segment_colors is None else unique_colors[inverse[group[0]]]
+            walls_mesh = self._extrude_walls_batch(corners[group], group_color)
+
+            # Keep track of which input wall each segment came from
+            # (faces 12*i .. 12*i+11 belong to segment i of the group)
+            walls_mesh.metadata["wall_index"] = segment_walls[group].tolist()
+
+            name = "walls" if segment_colors is None else f"walls_{group_idx}"
+            geometry[name] = walls_mesh
+
+        # Step 3: Create the floor mesh
+        geometry["floor"] = self._create_floor(corners)
         
-        # Add floor mesh
-        scene.add_geometry(
-            floor_mesh, 
-            node_name="floor",
-            geom_name="floor"
-        )
+        # Step 4: Assemble the scene in one constructor call; node names
+        # match the geometry names
+        import trimesh
+        scene = trimesh.Scene(geometry=geometry)
         
         return scene
     
@@ -404,25 +715,29 @@ class HouseBuilder:
         if not self.room_metadata:
             return "No room information available"
         
-        summary = "Floor Plan Rooms:\n" + "=" * 40 + "\n"
-        total_area = 0
+        parts: List[str] = ["Floor Plan Rooms:\n", "=" * 40, "\n"]
         
         for room_id, info in self.room_metadata.items():
             name = info.get("name", "Unknown")
             area = info.get("area", 0)
             dimensions = info.get("dimensions", [0, 0])
             
-            summary += f"\n{name}:\n"
-            summary += f"  Type: {info.get('type', 'N/A')}\n"
-            summary += f"  Dimensions: {dimensions[0]:.2f}m × {dimensions[1]:.2f}m\n"
-            summary += f"  Area: {area:.2f} sq.m\n"
-            
-            total_area += area
+            parts.append(f"\n{name}:\n")
+            parts.append(f"  Type: {info.get('type', 'N/A')}\n")
+            parts.append(f"  Dimensions: {dimensions[0]:.2f}m × {dimensions[1]:.2f}m\n")
+            parts.append(f"  Area: {area:.2f} sq.m\n")
+        
+        areas = np.fromiter(
+            (info.get("area", 0) for info in self.room_metadata.values()),
+            dtype=np.float64,
+            count=len(self.room_metadata)
+        )
+        total_area = areas.sum()
         
-        summary += "\n" + "=" * 40 + "\n"
-        summary += f"Total Area: {total_area:.2f} sq.m\n"
+        parts.append("\n" + "=" * 40 + "\n")
+        parts.append(f"Total Area: {total_area:.2f} sq.m\n")
         
-        return summary
+        return "".join(parts)
     
     def export_to_glb(self, scene: trimesh.Scene, output_path: str) -> None:
         """
@@ -432,7 +747,23 @@ class HouseBuilder:
             scene: The trimesh.Scene to export
             output_path: File path for the output GLB file
         """
-        scene.export(output_path, file_type='glb')
+        with open(output_path, "wb") as f:
+            f.write(self.export_to_glb_bytes(scene))
+    
+    def export_to_glb_bytes(self, scene: trimesh.Scene) -> bytes:
+        """
+        Serialize a trimesh Scene to GLB in memory.
+        
+        Useful when the model is sent over a network or kept in memory
+        rather than written to disk.
+        
+        Args:
+            scene: The trimesh.Scene to export
+            
+        Returns:
+            The binary GLB file contents
+        """
+        return scene.export(file_type='glb')
     
     def set_room_colors(self, custom_colors: Dict[str, Tuple[float, float, float]]) -> None:
         """
@@ -464,3 +795,12 @@ class HouseBuilder:
             RGB color tuple (r, g, b) normalized to 0-1
         """
         return self.color_manager.get_color(room_type)
+    
+    def reset(self) -> None:
+        """
+        Clear the per-plan state so the builder can be reused for another plan.
+        
+        Geometry settings, colors and internal caches are kept.
+        """
+        self.room_metadata = {}
+        self.room_segment_mapping = {}
@@ -0,0 +1,361 @@
+"""
+Tests for the Web Application Helpers
+
+These tests exercise the caching, file handling and parsing helpers of
+ui/app.py directly. Gradio is only needed when a user-facing error is
+raised; when it is not installed, a minimal stand-in providing gr.Error
+is used instead.
+"""
+
+import json
+import sys
+import os
+import threading
+import types
+
+import pytest
+
+# Add src and ui directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../ui'))
+
+import app
+
+
+@pytest.fixture
+def gradio_error(monkeypatch):
+    """Return the gr.Error class, stubbing Gradio if it is not installed."""
+    try:
+        import gradio
+    except ImportError:
+        gradio = types.ModuleType("gradio")
+        gradio.Error = type("Error", (Exception,), {})
+        monkeypatch.setitem(sys.modules, "gradio", gradio)
+    return gradio.Error
+
+
+@pytest.fixture
+def ui_tmpdir(tmp_path, monkeypatch):
+    """Point the UI's per-process temp directory at an empty test directory."""
+    ui_dir = tmp_path / "ui"
+    ui_dir.mkdir()
+    monkeypatch.setattr(app, "_TMPDIR", str(ui_dir))
+    return ui_dir
+
+
+@pytest.fixture
+def empty_result_cache(monkeypatch):
+    """Start with an empty result cache and no gltfpack."""
+    monkeypatch.setattr(app, "_RESULT_CACHE", {})
+    monkeypatch.setattr(app, "_GLTFPACK", None)
+
+
+@pytest.fixture
+def plan_file(tmp_path):
+    """Write a small floor plan with one room and return its path."""
+    path = tmp_path / "plan.json"
+    path.write_text(json.dumps({
+        "name": "Test Plan",
+        "walls": [[[0.0, 0.0], [4.0, 0.0]], [[4.0, 0.0], [4.0, 3.0]]],
+        "rooms": {"r1": {"name": "Bed", "type": "bedroom", "dimensions": [4, 3], "area": 12}},
+        "room_walls": {"r1": [0]},
+    }))
+    return str(path)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_helpers_with_and_without_orjson(monkeypatch, use_orjson):
+    """JSON parsing and serialization behave the same with the stdlib fallback."""
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(app, "orjson", None)
+
+    data = {"walls": [[[0.0, 0.0], [1.5, 0.0]]], "name": "Plan ✓"}
+
+    encoded = app._dumps_json(data)
+    assert isinstance(encoded, bytes)
+    assert b'\n  "walls"' in encoded  # 2-space indent
+    assert app._loads_json(encoded) == data
+
+    with pytest.raises(json.JSONDecodeError):
+        app._loads_json(b'{"walls": [')
+
+
+def test_hex_to_rgb():
+    """Hex colors parse with or without "#"; empty input means no custom color."""
+    assert app.hex_to_rgb("#FF8080") == (1.0, 128 / 255.0, 128 / 255.0)
+    assert app.hex_to_rgb("00ff7f") == (0.0, 1.0, 127 / 255.0)
+    assert app.hex_to_rgb("") is None
+
+
+@pytest.mark.parametrize("hex_color", ["#FFF", "#12345", "#GG0000", "#"])
+def test_hex_to_rgb_rejects_invalid(hex_color):
+    """Short or non-hex colors raise ValueError."""
+    with pytest.raises(ValueError):
+        app.hex_to_rgb(hex_color)
+
+
+def test_result_cache_hit(ui_tmpdir, empty_result_cache, plan_file, monkeypatch):
+    """An identical upload and color set returns the cached result without rebuilding."""
+    first = app.process_floor_plan(plan_file)
+    assert os.path.exists(first[0])
+    assert len(app._RESULT_CACHE) == 1
+
+    def fail(colors_key):
+        raise AssertionError("cache hit must not build the model again")
+
+    monkeypatch.setattr(app, "_get_builder", fail)
+    assert app.process_floor_plan(plan_file) is first
+
+
+def test_result_cache_key_includes_colors(ui_tmpdir, empty_result_cache, plan_file):
+    """Custom colors are part of the cache key and of the model file name."""
+    default = app.process_floor_plan(plan_file)
+    custom = app.process_floor_plan(plan_file, custom_bedroom_color="#123456")
+
+    assert len(app._RESULT_CACHE) == 2
+    assert custom[0] != default[0]
+    assert "#123456" in custom[2]
+    assert app.process_floor_plan(plan_file, custom_bedroom_color="#123456") is custom
+
+
+def test_result_cache_concurrent_fill(ui_tmpdir, empty_result_cache, plan_file, monkeypatch):
+    """Concurrent requests filling and evicting the cache neither fail nor overfill it."""
+    monkeypatch.setattr(app, "_RESULT_CACHE_SIZE", 2)
+    colors = ["#ff0000", "#00ff00", "#0000ff", "#ffff00", ""]
+    errors = []
+
+    def run(offset):
+        for i in range(10):
+            try:
+                result = app.process_floor_plan(plan_file, colors[(offset + i) % len(colors)])
+                assert os.path.exists(result[0])
+            except Exception as e:  # Collected so the main thread can fail
+                errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(k,)) for k in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(app._RESULT_CACHE) <= 2
+
+
+def test_builder_pool_reuse_and_limit(monkeypatch):
+    """Builders are reused per color set and thread, up to _BUILDER_POOL_SIZE of them."""
+    monkeypatch.setattr(app, "_BUILDERS", threading.local())
+    monkeypatch.setattr(app, "_BUILDER_POOL_SIZE", 2)
+    red = (("bedroom", (1.0, 0.0, 0.0)),)
+    blue = (("bedroom", (0.0, 0.0, 1.0)),)
+
+    default = app._get_builder(())
+    default.extract_room_info({"rooms": {"r1": {"type": "kitchen"}}})
+    assert app._get_builder(()) is default
+    assert default.room_metadata == {}  # Reset before reuse
+
+    custom = app._get_builder(red)
+    assert custom is not default
+    assert custom.get_color_for_room_type("bedroom") == (1.0, 0.0, 0.0)
+
+    # A third color set evicts the oldest builder
+    app._get_builder(blue)
+    assert app._get_builder(red) is custom
+    assert app._get_builder(()) is not default
+
+    # Other threads get their own builders
+    other = []
+    thread = threading.Thread(target=lambda: other.append(app._get_builder(red)))
+    thread.start()
+    thread.join()
+    assert other[0] is not custom
+
+
+def _fake_gltfpack(directory, script):
+    """Write an executable stand-in for gltfpack and return its path."""
+    path = directory / "gltfpack"
+    path.write_text("#!/bin/sh\n" + script)
+    path.chmod(0o755)
+    return str(path)
+
+
+def test_pack_glb_without_gltfpack(ui_tmpdir, monkeypatch):
+    """Without gltfpack on PATH the model is written unpacked."""
+    monkeypatch.setattr(app, "_GLTFPACK", None)
+    glb_path = str(ui_tmpdir / "model.glb")
+
+    assert app._pack_glb(b"glb data", glb_path) == glb_path
+    assert os.listdir(ui_tmpdir) == ["model.glb"]
+    with open(glb_path, "rb") as f:
+        assert f.read() == b"glb data"
+
+
+@pytest.mark.skipif(os.name == "nt", reason="stand-in gltfpack is a shell script")
+@pytest.mark.parametrize("script, packed", [
+    ('cp "$2" "$4"\n', True),   # Arguments: -i <input> -o <output>
+    ("exit 1\n", False),
+])
+def test_pack_glb_with_gltfpack(ui_tmpdir, tmp_path_factory, monkeypatch, script, packed):
+    """A working gltfpack gives the _packed model; a failing one falls back to the GLB."""
+    bin_dir = tmp_path_factory.mktemp("bin")
+    monkeypatch.setattr(app, "_GLTFPACK", _fake_gltfpack(bin_dir, script))
+    glb_path = str(ui_tmpdir / "model.glb")
+
+    output_path = app._pack_glb(b"glb data", glb_path)
+
+    expected = "model_packed.glb" if packed else "model.glb"
+    assert output_path == str(ui_tmpdir / expected)
+    assert os.listdir(ui_tmpdir) == [expected]  # No temporary files left
+
+
+@pytest.mark.parametrize("size_delta, use_orjson, mapped", [
+    (-1, True, False),  # Just below the threshold: read into bytes
+    (0, True, True),    # At the threshold: memory-mapped
+    (0, False, False),  # The stdlib parser needs bytes, so no mapping
+])
+def test_file_buffer_mmap_threshold(tmp_path, monkeypatch, size_delta, use_orjson, mapped):
+    """Uploads from _MMAP_MIN_BYTES on are memory-mapped when orjson can parse them."""
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(app, "orjson", None)
+    monkeypatch.setattr(app, "_MMAP_MIN_BYTES", 64)
+
+    document = json.dumps({"walls": [[[0, 0], [1, 0]]]}).encode()
+    document += b" " * (64 + size_delta - len(document))
+    path = tmp_path / "plan.json"
+    path.write_bytes(document)
+
+    with app._file_buffer(str(path)) as raw:
+        assert isinstance(raw, memoryview) == mapped
+        assert bytes(raw) == document
+        assert app._loads_json(raw) == {"walls": [[[0, 0], [1, 0]]]}
+
+
+def _run_asgi(asgi_app, path):
+    """Call an ASGI app for a GET request and return the messages it sends."""
+    import asyncio
+
+    messages = []
+    disconnected = None
+
+    async def receive():
+        # Nothing to read from the client; wait until the app stops listening
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    async def main():
+        nonlocal disconnected
+        disconnected = asyncio.Event()
+        scope = {
+            "type": "http", "method": "GET", "path": path, "query_string": b"",
+            "headers": [(b"accept-encoding", b"gzip")],
+        }
+        await asyncio.wait_for(asgi_app(scope, receive, send), timeout=5)
+
+    asyncio.run(main())
+    return messages
+
+
+def test_gzip_keeps_event_stream_chunks():
+    """Queue events pass through uncompressed, one chunk each; GLB downloads are gzipped."""
+    pytest.importorskip("starlette")
+    from starlette.responses import Response, StreamingResponse
+
+    events = [b"data: {\"msg\": \"progress\"}\n\n", b"data: {\"msg\": \"process_completed\"}\n\n"]
+
+    async def inner(scope, receive, send):
+        if scope["path"].endswith(".glb"):
+            response = Response(b"\0" * 4096, media_type="model/gltf-binary")
+        else:
+            async def stream():
+                for event in events:
+                    yield event
+            response = StreamingResponse(stream(), media_type="text/event-stream")
+        await response(scope, receive, send)
+
+    middleware = app._GLBGZipMiddleware(inner, minimum_size=1024)
+
+    messages = _run_asgi(middleware, "/queue/data")
+    headers = dict(messages[0]["headers"])
+    assert b"content-encoding" not in headers
+    bodies = [m["body"] for m in messages[1:] if m["body"]]
+    assert bodies == events
+
+    messages = _run_asgi(middleware, "/file=/tmp/floorplan_3d_abc.glb")
+    headers = dict(messages[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+
+
+def test_write_atomic(ui_tmpdir):
+    """_write_atomic replaces the file in one step and leaves no temporary files."""
+    path = str(ui_tmpdir / "sample.json")
+
+    app._write_atomic(path, b"first")
+    app._write_atomic(path, b"second")
+
+    assert os.listdir(ui_tmpdir) == ["sample.json"]
+    with open(path, "rb") as f:
+        assert f.read() == b"second"
+
+
+def test_tmpdir_removed_at_exit():
+    """Each process gets its own floorplan_ui_ directory, removed when it exits."""
+    import subprocess
+
+    ui_dir = os.path.join(os.path.dirname(__file__), '../ui')
+    output = subprocess.run(
+        [sys.executable, "-c", "import app; print(app._TMPDIR)"],
+        cwd=ui_dir, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+    assert os.path.basename(output).startswith("floorplan_ui_")
+    assert output != app._TMPDIR
+    assert not os.path.exists(output)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="stand-in gltfpack is a shell script")
+def test_identical_concurrent_requests(ui_tmpdir, empty_result_cache, plan_file,
+                                       tmp_path_factory, monkeypatch):
+    """Identical requests share one content-named model without racing on it."""
+    bin_dir = tmp_path_factory.mktemp("bin")
+    monkeypatch.setattr(app, "_GLTFPACK", _fake_gltfpack(bin_dir, 'sleep 0.1\ncp "$2" "$4"\n'))
+    results, errors = [], []
+
+    def run():
+        try:
+            results.append(app.process_floor_plan(plan_file)[0])
+        except Exception as e:  # Collected so the main thread can fail
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(set(results)) == 1 and os.path.exists(results[0])
+    assert os.path.basename(results[0]).startswith("floorplan_3d_")
+    assert os.listdir(ui_tmpdir) == [os.path.basename(results[0])]
+
+
+@pytest.mark.parametrize("document", [
+    {"rooms": {"r1": {"type": "kitchen"}}},
+    {"walls": []},
+    {"walls": {"w1": [[0, 0], [1, 0]]}},
+])
+def test_upload_without_walls_rejected(tmp_path, gradio_error, empty_result_cache,
+                                       monkeypatch, document):
+    """Uploads without a non-empty walls list are rejected after the single parse."""
+    monkeypatch.setattr(app, "_MMAP_MIN_BYTES", 64)  # Cover the memory-mapped path too
+    path = tmp_path / "plan.json"
+    path.write_text(json.dumps(document) + " " * 128)
+
+    with pytest.raises(gradio_error, match="Invalid JSON format"):
+        app.process_floor_plan(str(path))
@@ -9,10 +9,14 @@ import json
 import sys
 import os
 
+import numpy as np
+import pytest
+
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
 
-from builder import HouseBuilder
+import builder as builder_module
+from builder import HouseBuilder, RoomColorManager, _to_color_255
 
 
 def test_basic_floor_plan():
@@ -87,6 +91,237 @@ def test_error_handling():
     return True
 
 
+def _wall_colors(scene):
+    """Map each wall group name to its single RGB color."""
+    colors = {}
+    for name, mesh in scene.geometry.items():
+        if name == "floor":
+            continue
+        vertex_colors = np.asarray(mesh.visual.vertex_colors)[:, :3]
+        assert (vertex_colors == vertex_colors[0]).all()
+        colors[name] = tuple(vertex_colors[0].tolist())
+    return colors
+
+
+def test_walls_grouped_by_room_color():
+    """Walls are merged into one walls_<k> mesh per color, in first-appearance order."""
+    builder = HouseBuilder()
+    data = {
+        "walls": [
+            [[0.0, 0.0], [4.0, 0.0]],
+            [[4.0, 0.0], [4.0, 3.0]],
+            [[4.0, 3.0], [0.0, 3.0]],
+            [[0.0, 3.0], [0.0, 0.0]],
+        ],
+        "rooms": {
+            "r1": {"name": "Kitchen", "type": "kitchen"},
+            "r2": {"name": "Bath", "type": "bathroom"},
+        },
+        "room_walls": {"r1": [1, 3], "r2": [2]},
+    }
+    
+    scene = builder.process_floorplan(data)
+    
+    assert sorted(scene.geometry) == ["floor", "walls_0", "walls_1", "walls_2"]
+    
+    default = tuple(_to_color_255(builder.get_color_for_room_type("default")).tolist())
+    kitchen = tuple(_to_color_255(builder.get_color_for_room_type("kitchen")).tolist())
+    bathroom = tuple(_to_color_255(builder.get_color_for_room_type("bathroom")).tolist())
+    assert _wall_colors(scene) == {"walls_0": default, "walls_1": kitchen, "walls_2": bathroom}
+    
+    # Walls 1 and 3 share one mesh of two 8-vertex, 12-face prisms
+    assert len(scene.geometry["walls_1"].vertices) == 16
+    assert len(scene.geometry["walls_1"].faces) == 24
+
+
+def test_single_mesh_without_room_colors():
+    """Disabling room colors gives one uncolored "walls" mesh."""
+    scene = HouseBuilder().process_floorplan(
+        {"walls": [[[0.0, 0.0], [1.0, 0.0]], [[1.0, 0.0], [1.0, 1.0]]]},
+        use_room_colors=False
+    )
+    
+    assert sorted(scene.geometry) == ["floor", "walls"]
+    assert len(scene.geometry["walls"].faces) == 2 * 12
+
+
+
+def test_wall_footprint_corners():
+    """Footprints are counter-clockwise rectangles offset by half the thickness."""
+    builder = HouseBuilder(wall_thickness=0.2)
+    
+    corners = builder._create_wall_polygons_batch(np.array([[[0.0, 0.0], [2.0, 0.0]]]))
+    
+    np.testing.assert_allclose(
+        corners[0], [[0.0, -0.1], [2.0, -0.1], [2.0, 0.1], [0.0, 0.1]], atol=1e-6
+    )
+
+
+
+def test_wall_index_metadata():
+    """metadata["wall_index"] names the input wall of every segment in a merged mesh."""
+    builder = HouseBuilder()
+    data = {
+        "walls": [
+            [[0.0, 0.0], [4.0, 0.0]],
+            ["outer", [[4.0, 0.0], [4.0, 3.0], [0.0, 3.0]]],
+            [[0.0, 3.0], [0.0, 0.0]],
+        ],
+        "rooms": {"r1": {"type": "kitchen"}},
+        "room_walls": {"r1": [2]},
+    }
+    
+    scene = builder.process_floorplan(data)
+    assert scene.geometry["walls_0"].metadata["wall_index"] == [0, 1, 1]
+    assert scene.geometry["walls_1"].metadata["wall_index"] == [2]
+    
+    scene = builder.process_floorplan(data, use_room_colors=False)
+    assert scene.geometry["walls"].metadata["wall_index"] == [0, 1, 1, 2]
+
+
+
+@pytest.mark.parametrize("walls", [
+    [[[1.0, 1.0], [1.0, 1.0]]],                      # Zero length
+    [[[0.0, 0.0]]],                                   # Single point
+    [["label", [[0.0, 0.0]]]],                        # Labeled single point
+    [[[0.0, 0.0], [float("nan"), 1.0]]],              # NaN coordinate
+    [["label", [[0.0, 0.0], [1.0, 1.0], [float("inf"), 2.0]]]],  # Infinite polyline point
+])
+def test_invalid_walls_raise(walls):
+    """Degenerate or non-finite walls are rejected with ValueError."""
+    with pytest.raises(ValueError):
+        HouseBuilder().process_floorplan({"walls": walls})
+
+
+
+def test_extract_room_info_keeps_input_keys():
+    """Room records keep the caller's keys and do not share state between calls."""
+    builder = HouseBuilder()
+    data = {"rooms": {1: {"name": "Office", "type": "office", "dimensions": [2, 3]}}}
+    
+    rooms = builder.extract_room_info(data)
+    assert list(rooms) == [1]
+    assert rooms[1]["area"] == 0
+    
+    rooms[1]["name"] = "Changed"
+    assert builder.extract_room_info(data)[1]["name"] == "Office"
+
+
+
+def test_labeled_and_polyline_walls():
+    """[label, coords] entries and polylines are split into 2-point segments."""
+    builder = HouseBuilder(wall_thickness=0.2, wall_height=3.0)
+    data = {
+        "walls": [
+            ["outer", [[0.0, 0.0], [4.0, 0.0], [4.0, 2.0]]],
+            [[4.0, 2.0], [0.0, 2.0]],
+        ]
+    }
+    
+    scene = builder.process_floorplan(data, use_room_colors=False)
+    walls = scene.geometry["walls"]
+    
+    assert walls.metadata["wall_index"] == [0, 0, 1]
+    assert len(walls.faces) == 3 * 12
+    # Flat caps: no wall extends past x=0, the others stick out by half the thickness
+    np.testing.assert_allclose(walls.bounds, [[0.0, -0.1, 0.0], [4.1, 2.1, 3.0]], atol=1e-6)
+
+
+
+def test_numba_footprints_match_numpy():
+    """The Numba kernel computes the same footprints as the NumPy path."""
+    pytest.importorskip("numba")
+    from _kernels import wall_corners
+    
+    rng = np.random.default_rng(0)
+    walls = rng.uniform(-50.0, 50.0, size=(1000, 2, 2)).astype(np.float32)
+    builder = HouseBuilder(wall_thickness=0.15)
+    
+    expected = builder._create_wall_polygons_batch(walls)
+    corners = np.empty((len(walls), 4, 2), dtype=np.float32)
+    zero_length = wall_corners(walls, builder.wall_thickness / 2, corners)
+    
+    assert zero_length == 0
+    np.testing.assert_allclose(corners, expected, atol=1e-4)
+
+
+
+def test_room_walls_with_unmatched_entries():
+    """String, fractional and out-of-range wall indices are ignored."""
+    builder = HouseBuilder()
+    data = {
+        "walls": [[[0.0, 0.0], [1.0, 0.0]], [[1.0, 0.0], [1.0, 1.0]]],
+        "rooms": {"r1": {"type": "kitchen"}},
+        "room_walls": {"r1": ["w1", 0.5, 7, -1, 1]},
+    }
+    
+    scene = builder.process_floorplan(data)
+    
+    assert scene.geometry["walls_0"].metadata["wall_index"] == [0]
+    assert scene.geometry["walls_1"].metadata["wall_index"] == [1]
+
+def test_room_walls_with_integral_floats():
+    """Integral float indices such as 1.0 still select their wall."""
+    builder = HouseBuilder()
+    data = {
+        "walls": [
+            [[0.0, 0.0], [1.0, 0.0]],
+            [[1.0, 0.0], [1.0, 1.0]],
+            [[1.0, 1.0], [0.0, 1.0]],
+        ],
+        "rooms": {"r1": {"type": "kitchen"}},
+        "room_walls": {"r1": [1.0, np.float64(2.0), float("nan")]},
+    }
+    
+    scene = builder.process_floorplan(data)
+    
+    kitchen = tuple(_to_color_255(builder.get_color_for_room_type("kitchen")).tolist())
+    assert scene.geometry["walls_1"].metadata["wall_index"] == [1, 2]
+    assert _wall_colors(scene)["walls_1"] == kitchen
+
+
+
+def test_color_manager_cache_invalidation():
+    """set_custom_colors takes effect for room types that were already looked up."""
+    manager = RoomColorManager()
+    
+    assert manager.get_color("Kitchen") == (1.0, 1.0, 0.7)
+    assert manager.get_color("Master Bedroom") == (1.0, 0.8, 0.8)
+    
+    manager.set_custom_colors({"kitchen": (0.1, 0.2, 0.3), "studio": (0.4, 0.5, 0.6)})
+    
+    assert manager.get_color("Kitchen") == (0.1, 0.2, 0.3)
+    assert manager.get_color("Studio Loft") == (0.4, 0.5, 0.6)
+    assert manager.get_color("unknown") == manager.get_color("default")
+
+
+def test_color_manager_cache_is_bounded():
+    """Arbitrary room types from uploads do not grow the color memo without limit."""
+    manager = RoomColorManager()
+    
+    for i in range(1000):
+        manager.get_color(f"room type {i}")
+    
+    assert manager._cached_color.cache_info().currsize <= 128
+    assert manager.get_color("Kitchen") == (1.0, 1.0, 0.7)
+
+
+
+def test_prism_faces_shared_and_capped():
+    """Prism face indices come from one shared, capped read-only buffer."""
+    faces = builder_module._prism_faces(3)
+    
+    assert faces.shape == (3, 12, 3)
+    assert not faces.flags.writeable
+    assert (faces[2] == faces[0] + 16).all()
+    assert np.shares_memory(builder_module._prism_faces(2), faces)
+    
+    # Plans past the cap are built for that call and not retained
+    big = builder_module._FACE_BUF_MAX_WALLS + 1
+    assert len(builder_module._prism_faces(big)) == big
+    assert len(builder_module._FACE_BUF) <= builder_module._FACE_BUF_MAX_WALLS
+
+
 if __name__ == "__main__":
     print("="*60)
     print("3D Floor Plan Converter - Test Suite")
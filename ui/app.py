@@ -6,17 +6,37 @@ This module provides a Gradio-based web interface for converting 2D floor plans
 
 """
 
+from __future__ import annotations
+
+import atexit
+import contextlib
+import functools
+import hashlib
 import json
+import mmap
 import os
+import shutil
+import subprocess
 import sys
 import tempfile
-from typing import Optional, Tuple
-import gradio as gr
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple, Union
+
+try:
+    import orjson  # Optional: faster JSON parsing and serialization
+except ImportError:
+    orjson = None
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
 
-from builder import HouseBuilder
+# Gradio and the builder (and NumPy with it) are imported on first use, so
+# importing this module for its handlers loads neither. Gradio evaluates the
+# handlers' type hints when events are registered, so names from this block
+# must not appear in their signatures.
+if TYPE_CHECKING:
+    import gradio as gr
+    from builder import HouseBuilder
 
 
 # Sample floor plan data for demonstration purposes
@@ -33,6 +53,328 @@ SAMPLE_FLOOR_PLAN = {
     ]
 }
 
+# Banner shown at the top of the interface
+_HEADER_HTML = """
+<div style="text-align: center; padding: 30px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; border-radius: 15px; margin-bottom: 20px; box-shadow: 0 8px 16px rgba(0,0,0,0.1);">
+    <h1 style="margin: 0; font-size: 2.5em; font-weight: bold;">🏗️ 3D Floor Plan Converter</h1>
+    <p style="font-size: 1.1em; margin-top: 15px; opacity: 0.95; font-weight: 300;">
+        Professional 2D→3D Floor Plan Transformation with Interactive Visualization v2.0
+    </p>
+    <p style="font-size: 0.9em; margin-top: 10px; opacity: 0.85;">
+        ✨ Enhanced with room-based coloring, improved geometry, and better UX
+    </p>
+</div>
+"""
+
+# Room types recolored by each custom color input, in input order
+# (bedroom, bathroom, kitchen, living room)
+_CUSTOM_COLOR_TYPES = (
+    ("bedroom", "master_bedroom"),
+    ("bathroom", "toilet"),
+    ("kitchen",),
+    ("living_room",),
+)
+
+# Horizontal rule used in the room details report
+_HR = "-" * 35
+
+# Text templates for the process_floor_plan outputs
+_STATUS_TEMPLATE = (
+    " Successfully generated 3D model!\n"
+    " Plan: {plan_name}\n"
+    " Processed {wall_count} wall{plural}\n"
+    " Room-based coloring applied\n"
+    " Output format: GLB (compatible with all 3D viewers)"
+)
+
+_MODEL_INFO_TEMPLATE = (
+    " Model Information\n"
+    "========================================\n\n"
+    "Processing Summary:\n"
+    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    "Plan: {plan_name}\n"
+    "Format: GLB (Binary 3D Model)\n"
+    "Wall Count: {wall_count}\n"
+    "Room Count: {room_count}\n\n"
+    "Geometry Settings:\n"
+    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    "Wall Thickness: 0.1 units\n"
+    "Wall Height: 2.5 units\n"
+    "Floor Offset: -0.05 units\n\n"
+    "Color Rendering:\n"
+    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    "Status:  Enabled\n"
+    "Method: Room-type based\n"
+    "Color Scheme: Enhanced palette\n\n"
+    "Export Details:\n"
+    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    "File: {file}\n"
+    "Size: {file}\n"
+    "Status:  Ready for download"
+)
+
+# Results of recent process_floor_plan calls, keyed on the uploaded file's
+# SHA-256 and the custom colors; oldest entries are evicted first
+_RESULT_CACHE: Dict[Tuple[str, Tuple], Tuple[str, str, str, str]] = {}
+_RESULT_CACHE_SIZE = 32
+_RESULT_CACHE_LOCK = threading.Lock()  # Requests run concurrently
+
+# Gradio already runs sync handlers in worker threads but queues each event
+# one request at a time by default; let model generation use every core
+_PROCESS_CONCURRENCY = os.cpu_count() or 1
+
+# Optional glTF optimizer; when it is on PATH, exported models are quantized
+# before being sent to the browser
+_GLTFPACK = shutil.which("gltfpack")
+_GLTFPACK_TIMEOUT = 30  # seconds
+
+# Uploads at least this large are memory-mapped and parsed in place by
+# orjson instead of being copied into a bytes object first
+_MMAP_MIN_BYTES = 1 << 20
+
+# Builders reused across requests, one set per worker thread (a builder keeps
+# the current plan's room metadata, so it must not be shared between threads)
+_BUILDERS = threading.local()
+_BUILDER_POOL_SIZE = 8
+
+# Absolute path of each template in the examples directory, resolved once.
+# Missing files are reported when the template is clicked, not at import.
+_EXAMPLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "examples"))
+_TEMPLATE_PATHS: Dict[str, str] = {
+    name: os.path.join(_EXAMPLES_DIR, filename)
+    for name, filename in {
+        "1bhk": "apartment_1bhk.json",
+        "2bhk": "apartment_2bhk.json",
+        "3bhk": "apartment_3bhk.json",
+        "villa": "house_villa.json",
+        "penthouse": "apartment_3bhk.json"  # Using 3bhk as fallback
+    }.items()
+}
+
+# Parsed template floor plans, keyed by template filename
+_TEMPLATE_CACHE: Dict[str, Dict[str, Any]] = {}
+
+# Status message of each loaded template, keyed by template name
+_TEMPLATE_STATUS_CACHE: Dict[str, str] = {}
+
+# Per-process directory for every file handed to Gradio (samples, template
+# copies, models). Names are derived from the content, so identical inputs
+# map to the same file; the directory is removed when the server exits.
+_TMPDIR = tempfile.mkdtemp(prefix="floorplan_ui_")
+atexit.register(shutil.rmtree, _TMPDIR, ignore_errors=True)
+
+
+def _user_error(message: str) -> Exception:
+    """Create a gr.Error, which Gradio shows to the user, importing Gradio on demand."""
+    import gradio as gr
+    
+    return gr.Error(message)
+
+
+@functools.lru_cache(maxsize=256)
+def hex_to_rgb(hex_color: str) -> Optional[Tuple[float, float, float]]:
+    """
+    Convert a hex color to an RGB tuple (0-1 range).
+    
+    Args:
+        hex_color: Hex color code, with or without "#" (e.g., "#FF8080")
+        
+    Returns:
+        Tuple of (r, g, b) normalized to 0-1, or None for an empty string
+        
+    Raises:
+        ValueError: If the string is not a 6-digit hex color
+    """
+    if not hex_color:
+        return None
+    rgb = bytes.fromhex(hex_color.lstrip('#')[:6])
+    if len(rgb) != 3:
+        raise ValueError(f"Invalid hex color: {hex_color}")
+    return (rgb[0] / 255.0, rgb[1] / 255.0, rgb[2] / 255.0)
+
+
+def _get_builder(colors_key: Tuple[Tuple[str, Tuple[float, float, float]], ...]) -> "HouseBuilder":
+    """
+    Return this thread's builder for a custom color configuration.
+    
+    Reused builders keep their color lookup cache and mesh buffers, and are
+    reset before each plan.
+    
+    Args:
+        colors_key: Sorted (room_type, rgb) pairs of the custom colors
+        
+    Returns:
+        A HouseBuilder with the UI's geometry settings and those colors
+    """
+    builders = getattr(_BUILDERS, "by_colors", None)
+    if builders is None:
+        builders = _BUILDERS.by_colors = {}
+    
+    builder = builders.get(colors_key)
+    if builder is not None:
+        builder.reset()
+        return builder
+    
+    if len(builders) >= _BUILDER_POOL_SIZE:
+        del builders[next(iter(builders))]
+    
+    from builder import HouseBuilder
+    
+    builder = HouseBuilder(
+        wall_thickness=0.1,
+        wall_height=2.5,
+        floor_offset=-0.05,
+        custom_colors=dict(colors_key) or None
+    )
+    builders[colors_key] = builder
+    return builder
+
+
+def _pack_glb(data: bytes, glb_path: str) -> str:
+    """
+    Publish a GLB model, quantized with gltfpack if it is installed.
+    
+    Positions and normals are stored as 16-bit integers
+    (KHR_mesh_quantization), which the browser viewer decodes natively.
+    gltfpack reads and writes private temporary files; only the finished
+    model is moved into place, so identical concurrent requests never see
+    a missing or half-written file.
+    
+    Args:
+        data: GLB file contents exported by the builder
+        glb_path: Destination path of the unpacked model; the packed model
+                  goes next to it with a "_packed" suffix
+        
+    Returns:
+        Path to the packed GLB, or glb_path if gltfpack is unavailable or fails
+    """
+    if _GLTFPACK is None:
+        _write_atomic(glb_path, data)
+        return glb_path
+    
+    packed_path = glb_path[:-len('.glb')] + '_packed.glb'
+    fd, src_path = tempfile.mkstemp(suffix='.glb', dir=_TMPDIR)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    fd, work_path = tempfile.mkstemp(suffix='.glb', dir=_TMPDIR)
+    os.close(fd)
+    try:
+        subprocess.run(
+            [_GLTFPACK, "-i", src_path, "-o", work_path],
+            check=True,
+            capture_output=True,
+            timeout=_GLTFPACK_TIMEOUT
+        )
+    except (OSError, subprocess.SubprocessError):
+        os.remove(work_path)
+        os.replace(src_path, glb_path)
+        return glb_path
+    
+    os.replace(work_path, packed_path)
+    os.remove(src_path)
+    return packed_path
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """
+    Write a file so that other requests never see it half-written.
+    
+    Args:
+        path: Destination path inside _TMPDIR
+        data: File contents
+    """
+    fd, work_path = tempfile.mkstemp(dir=_TMPDIR)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(work_path, path)
+
+
+@contextlib.contextmanager
+def _file_buffer(path: str) -> Iterator[Union[bytes, memoryview]]:
+    """
+    Provide the contents of a file as a buffer.
+    
+    Large files are memory-mapped when orjson is available (it parses
+    buffers directly); otherwise the file is read into bytes.
+    
+    Args:
+        path: Path to the file
+        
+    Yields:
+        The file contents, valid until the context exits
+    """
+    with open(path, 'rb') as f:
+        if orjson is None or os.fstat(f.fileno()).st_size < _MMAP_MIN_BYTES:
+            yield f.read()
+            return
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                # The mapping cannot close while a view is exported
+                view.release()
+
+
+def _loads_json(raw: Union[bytes, memoryview]) -> Any:
+    """
+    Parse JSON bytes, using orjson when it is installed.
+    
+    Args:
+        raw: UTF-8 encoded JSON document (a memoryview only with orjson)
+        
+    Returns:
+        The parsed JSON data
+        
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+@functools.lru_cache(maxsize=256)
+def _rgb_to_hex(color: Tuple[float, float, float]) -> str:
+    """Convert an RGB tuple (0-1 range) to a lowercase 6-digit hex string."""
+    return bytes(int(c * 255) for c in color).hex()
+
+
+def _read_json(path: str) -> Any:
+    """
+    Parse a JSON file, using orjson when it is installed.
+    
+    Args:
+        path: Path to the JSON file
+        
+    Returns:
+        The parsed JSON data
+        
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    with open(path, 'rb') as f:
+        return _loads_json(f.read())
+
+
+def _dumps_json(data: Any) -> bytes:
+    """
+    Serialize data as 2-space indented JSON, using orjson when it is installed.
+    
+    Args:
+        data: JSON-serializable data
+        
+    Returns:
+        The UTF-8 encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+# The sample is constant, so it is serialized once at import
+_SAMPLE_BYTES = _dumps_json(SAMPLE_FLOOR_PLAN)
+
 
 def generate_sample_json() -> str:
     """
@@ -44,63 +386,53 @@ def generate_sample_json() -> str:
     Returns:
         Path to the generated sample JSON file
     """
-    # Create a temporary file
-    temp_file = tempfile.NamedTemporaryFile(
-        mode='w', 
-        suffix='.json', 
-        delete=False,
-        prefix='sample_floorplan_'
-    )
-    
-    # Write the sample data
-    json.dump(SAMPLE_FLOOR_PLAN, temp_file, indent=2)
-    temp_file.close()
+    # The sample never changes, so it is written once per process (and
+    # rewritten from the cached bytes if the file was removed)
+    sample_path = os.path.join(_TMPDIR, 'sample_floorplan.json')
+    if not os.path.exists(sample_path):
+        _write_atomic(sample_path, _SAMPLE_BYTES)
     
-    return temp_file.name
+    return sample_path
 
 
 def generate_template_json(template: str) -> Tuple[str, str]:
     """
     Generate a floor plan from a predefined template.
     
+    Templates are parsed once and copied once into the UI's temporary
+    directory; later clicks reuse both.
+    
     Args:
         template: Template name ('1bhk', '2bhk', '3bhk', 'villa', 'penthouse')
     
     Returns:
         Tuple of (file_path, status_message)
     """
-    # Load template from examples directory
-    template_map = {
-        "1bhk": "apartment_1bhk.json",
-        "2bhk": "apartment_2bhk.json",
-        "3bhk": "apartment_3bhk.json",
-        "villa": "house_villa.json",
-        "penthouse": "apartment_3bhk.json"  # Using 3bhk as fallback
-    }
-    
     try:
-        # Get the template filename
-        template_filename = template_map.get(template.lower(), "apartment_2bhk.json")
-        template_path = os.path.join(
-            os.path.dirname(__file__),
-            "../examples",
-            template_filename
-        )
-        
-        # Load the template file
-        with open(template_path, 'r') as f:
-            floor_plan = json.load(f)
-        
-        # Create temporary file
-        temp_file = tempfile.NamedTemporaryFile(
-            mode='w',
-            suffix='.json',
-            delete=False,
-            prefix=f'{template}_'
-        )
-        
-        json.dump(floor_plan, temp_file, indent=2)
-        temp_file.close()
+        # Get the template file (unknown names fall back to 2 BHK)
+        template_path = _TEMPLATE_PATHS.get(template.lower(), _TEMPLATE_PATHS["2bhk"])
+        template_filename = os.path.basename(template_path)
+        
+        output_path = os.path.join(_TMPDIR, template_filename)
+        
+        # Warm clicks: the copy and the status message already exist
+        status_msg = _TEMPLATE_STATUS_CACHE.get(template)
+        if status_msg is not None and os.path.exists(output_path):
+            return output_path, status_msg
+        
+        # Load the template file (parsed once per process)
+        floor_plan = _TEMPLATE_CACHE.get(template_filename)
+        if floor_plan is None:
+            floor_plan = _read_json(template_path)
+            _TEMPLATE_CACHE[template_filename] = floor_plan
+        
+        # Copy the example file byte for byte (Gradio only serves files from
+        # its allowed directories) rather than re-dumping the parsed data
+        if not os.path.exists(output_path):
+            fd, work_path = tempfile.mkstemp(dir=_TMPDIR)
+            os.close(fd)
+            shutil.copyfile(template_path, work_path)
+            os.replace(work_path, output_path)
         
         plan_name = floor_plan.get('name', template)
         total_area = floor_plan.get('total_area', 0)
@@ -111,14 +443,15 @@ def generate_template_json(template: str) -> Tuple[str, str]:
             f" Total Area: {total_area:.2f} sq.m\n"
             f" Rooms: {room_count}"
         )
+        _TEMPLATE_STATUS_CACHE[template] = status_msg
         
-        return temp_file.name, status_msg
+        return output_path, status_msg
         
     except Exception as e:
-        raise gr.Error(f"Error loading template: {str(e)}. Please check that example files exist.")
+        raise _user_error(f"Error loading template: {str(e)}. Please check that example files exist.")
 
 
-def process_floor_plan(uploaded_file: Optional[gr.File], custom_bedroom_color: Optional[str] = None, 
+def process_floor_plan(uploaded_file: Optional[str], custom_bedroom_color: Optional[str] = None, 
                        custom_bathroom_color: Optional[str] = None, custom_kitchen_color: Optional[str] = None,
                        custom_livingroom_color: Optional[str] = None) -> Tuple[Optional[str], str, str, str]:
     """
@@ -129,7 +462,7 @@ def process_floor_plan(uploaded_file: Optional[gr.File], custom_bedroom_color: O
     along with status information and room details.
     
     Args:
-        uploaded_file: A Gradio File object containing the uploaded JSON
+        uploaded_file: Path of the uploaded JSON file (the File input uses type="filepath")
         custom_bedroom_color: Hex color for bedrooms (e.g., "#FF8080")
         custom_bathroom_color: Hex color for bathrooms
         custom_kitchen_color: Hex color for kitchens
@@ -143,163 +476,156 @@ def process_floor_plan(uploaded_file: Optional[gr.File], custom_bedroom_color: O
     """
     # Validate that a file was uploaded
     if uploaded_file is None:
-        raise gr.Error("Please upload a JSON file to continue.")
+        raise _user_error("Please upload a JSON file to continue.")
     
     try:
-        # Read and parse the JSON file
-        with open(uploaded_file.name, 'r') as f:
-            json_data = json.load(f)
+        # Read, fingerprint and parse the JSON file
+        # Gradio passes a str subclass that also carries the path as .name
+        upload_path = getattr(uploaded_file, "name", uploaded_file)
+        with _file_buffer(upload_path) as raw:
+            digest = hashlib.sha256(raw).hexdigest()
+            json_data = _loads_json(raw)
         
         # Validate the structure
         if "walls" not in json_data:
-            raise gr.Error(
+            raise _user_error(
                 "Invalid JSON format: Missing 'walls' key. "
                 "Expected format: {\"walls\": [[[x1, y1], [x2, y2]], ...]}"
             )
         
-        if not isinstance(json_data["walls"], list):
-            raise gr.Error(
+        walls = json_data["walls"]
+        
+        if not isinstance(walls, list):
+            raise _user_error(
                 "Invalid JSON format: 'walls' must be a list of wall coordinates."
             )
         
-        if len(json_data["walls"]) == 0:
-            raise gr.Error(
+        if len(walls) == 0:
+            raise _user_error(
                 "Invalid JSON format: 'walls' list is empty. "
                 "Please provide at least one wall."
             )
         
         # Build custom colors dictionary if provided
         custom_colors = {}
-        def hex_to_rgb(hex_color: str) -> Tuple[float, float, float]:
-            """Convert hex color to RGB tuple (0-1 range)."""
-            if not hex_color:
-                return None
-            hex_color = hex_color.lstrip('#')
-            return tuple(int(hex_color[i:i+2], 16) / 255.0 for i in (0, 2, 4))
-        
-        if custom_bedroom_color:
-            custom_colors["bedroom"] = hex_to_rgb(custom_bedroom_color)
-            custom_colors["master_bedroom"] = hex_to_rgb(custom_bedroom_color)
-        
-        if custom_bathroom_color:
-            custom_colors["bathroom"] = hex_to_rgb(custom_bathroom_color)
-            custom_colors["toilet"] = hex_to_rgb(custom_bathroom_color)
-        
-        if custom_kitchen_color:
-            custom_colors["kitchen"] = hex_to_rgb(custom_kitchen_color)
-        
-        if custom_livingroom_color:
-            custom_colors["living_room"] = hex_to_rgb(custom_livingroom_color)
-        
-        # Initialize the builder with custom colors
-        builder = HouseBuilder(
-            wall_thickness=0.1,
-            wall_height=2.5,
-            floor_offset=-0.05,
-            custom_colors=custom_colors if custom_colors else None
+        color_inputs = (
+            custom_bedroom_color, custom_bathroom_color,
+            custom_kitchen_color, custom_livingroom_color
         )
-        
-        # Process the floor plan
-        scene = builder.process_floorplan(json_data, use_room_colors=True)
-        
-        # Export to a temporary GLB file
-        output_file = tempfile.NamedTemporaryFile(
-            suffix='.glb', 
-            delete=False,
-            prefix='floorplan_3d_'
-        )
-        output_file.close()
-        
-        builder.export_to_glb(scene, output_file.name)
+        for hex_color, room_types in zip(color_inputs, _CUSTOM_COLOR_TYPES):
+            if hex_color:
+                rgb = hex_to_rgb(hex_color)
+                for room_type in room_types:
+                    custom_colors[room_type] = rgb
+        
+        # Reuse the previous result for an identical file and color set
+        colors_key = tuple(sorted(custom_colors.items()))
+        cache_key = (digest, colors_key)
+        with _RESULT_CACHE_LOCK:
+            cached = _RESULT_CACHE.get(cache_key)
+        if cached is not None and os.path.exists(cached[0]):
+            return cached
+        
+        # Get a builder configured with the custom colors
+        builder = _get_builder(colors_key)
+        
+        # The model file is named after the inputs, so an identical request
+        # (even one evicted from the result cache) finds it already built
+        model_key = hashlib.sha256(f"{digest}{colors_key!r}".encode('utf-8')).hexdigest()[:32]
+        glb_path = os.path.join(_TMPDIR, f'floorplan_3d_{model_key}.glb')
+        packed_path = glb_path[:-len('.glb')] + '_packed.glb'
+        
+        if os.path.exists(packed_path):
+            output_path = packed_path
+        elif os.path.exists(glb_path):
+            output_path = glb_path
+        else:
+            # Process the floor plan and export it to GLB
+            scene = builder.process_floorplan(json_data, use_room_colors=True)
+            output_path = _pack_glb(builder.export_to_glb_bytes(scene), glb_path)
         
         # Generate success message
-        wall_count = len(json_data["walls"])
+        rooms = json_data.get("rooms")
+        wall_count = len(walls)
+        room_count = len(rooms) if rooms is not None else 0
         plan_name = json_data.get("name", "Floor Plan")
         plan_desc = json_data.get("description", "")
         total_area = json_data.get("total_area", 0)
         
-        status_message = (
-            f" Successfully generated 3D model!\n"
-            f" Plan: {plan_name}\n"
-            f" Processed {wall_count} wall{'s' if wall_count != 1 else ''}\n"
-            f" Room-based coloring applied\n"
-            f" Output format: GLB (compatible with all 3D viewers)"
-        )
+        status_message = _STATUS_TEMPLATE.format_map({
+            "plan_name": plan_name,
+            "wall_count": wall_count,
+            "plural": "s" if wall_count != 1 else ""
+        })
         
         if plan_desc:
             status_message += f"\n {plan_desc}"
         
         # Generate room details
-        room_details = ""
-        if "rooms" in json_data:
-            room_details = " Room Details:\n" + "-" * 35 + "\n\n"
+        parts = []
+        if rooms is not None:
+            parts.append(f" Room Details:\n{_HR}\n\n")
             total_room_area = 0
+            type_to_hex: Dict[str, str] = {}  # Color label per distinct room type
             
-            for room_id, room_info in json_data["rooms"].items():
+            for room_id, room_info in rooms.items():
                 name = room_info.get("name", "Room")
                 area = room_info.get("area", 0)
                 room_type = room_info.get("type", "")
                 dimensions = room_info.get("dimensions", [0, 0])
                 
-                # Get color for this room type
-                color = builder.get_color_for_room_type(room_type) if room_type else None
-                color_hex = ""
-                if color:
-                    color_hex = f" [Color: #{int(color[0]*255):02x}{int(color[1]*255):02x}{int(color[2]*255):02x}]"
+                # Get color for this room type, once per distinct type
+                color_hex = type_to_hex.get(room_type)
+                if color_hex is None:
+                    color = builder.get_color_for_room_type(room_type) if room_type else None
+                    color_hex = f" [Color: #{_rgb_to_hex(color)}]" if color else ""
+                    type_to_hex[room_type] = color_hex
                 
-                room_details += f" {name}{color_hex}\n"
-                if room_type:
-                    room_details += f"   Type: {room_type}\n"
-                room_details += f"   Dimensions: {dimensions[0]:.2f}m × {dimensions[1]:.2f}m\n"
-                room_details += f"   Area: {area:.2f} sq.m\n\n"
+                type_line = f"   Type: {room_type}\n" if room_type else ""
+                parts.append(
+                    f" {name}{color_hex}\n"
+                    f"{type_line}"
+                    f"   Dimensions: {dimensions[0]:.2f}m × {dimensions[1]:.2f}m\n"
+                    f"   Area: {area:.2f} sq.m\n\n"
+                )
                 total_room_area += area
             
-            room_details += "-" * 35 + "\n"
-            room_details += f"Total Room Area: {total_room_area:.2f} sq.m"
+            parts.append(f"{_HR}\n")
+            parts.append(f"Total Room Area: {total_room_area:.2f} sq.m")
         
         if total_area > 0:
-            room_details += f"\n\n Total Plan Area: {total_area:.2f} sq.m"
+            parts.append(f"\n\n Total Plan Area: {total_area:.2f} sq.m")
+        
+        room_details = "".join(parts)
         
         # Generate model information
-        model_info = (
-            f" Model Information\n"
-            f"{'='*40}\n\n"
-            f"Processing Summary:\n"
-            f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            f"Plan: {plan_name}\n"
-            f"Format: GLB (Binary 3D Model)\n"
-            f"Wall Count: {wall_count}\n"
-            f"Room Count: {len(json_data.get('rooms', {}))}\n\n"
-            f"Geometry Settings:\n"
-            f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            f"Wall Thickness: 0.1 units\n"
-            f"Wall Height: 2.5 units\n"
-            f"Floor Offset: -0.05 units\n\n"
-            f"Color Rendering:\n"
-            f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            f"Status:  Enabled\n"
-            f"Method: Room-type based\n"
-            f"Color Scheme: Enhanced palette\n\n"
-            f"Export Details:\n"
-            f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            f"File: {output_file.name}\n"
-            f"Size: {output_file.name}\n"
-            f"Status:  Ready for download"
-        )
+        model_info = _MODEL_INFO_TEMPLATE.format_map({
+            "plan_name": plan_name,
+            "wall_count": wall_count,
+            "room_count": room_count,
+            "file": output_path
+        })
+        
+        result = (output_path, status_message, room_details, model_info)
         
-        return output_file.name, status_message, room_details, model_info
+        with _RESULT_CACHE_LOCK:
+            if cache_key not in _RESULT_CACHE and len(_RESULT_CACHE) >= _RESULT_CACHE_SIZE:
+                del _RESULT_CACHE[next(iter(_RESULT_CACHE))]
+            _RESULT_CACHE[cache_key] = result
+        
+        return result
         
     except json.JSONDecodeError as e:
-        raise gr.Error(
+        raise _user_error(
             f"Invalid JSON file: {str(e)}\n"
             "Please ensure your file contains valid JSON syntax."
         )
     
     except ValueError as e:
-        raise gr.Error(f"Data validation error: {str(e)}")
+        raise _user_error(f"Data validation error: {str(e)}")
     
     except Exception as e:
-        raise gr.Error(
+        raise _user_error(
             f"An unexpected error occurred: {str(e)}\n"
             "Please check your input data and try again."
         )
@@ -322,6 +648,7 @@ def create_interface() -> gr.Blocks:
     Returns:
         A configured Gradio Blocks interface
     """
+    import gradio as gr
     
     interface = gr.Blocks(
         title="3D Floor Plan Converter v2"
@@ -332,19 +659,7 @@ def create_interface() -> gr.Blocks:
         # Header section with improved styling
         with gr.Row():
             with gr.Column():
-                gr.HTML(
-                    """
-                    <div style="text-align: center; padding: 30px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; border-radius: 15px; margin-bottom: 20px; box-shadow: 0 8px 16px rgba(0,0,0,0.1);">
-                        <h1 style="margin: 0; font-size: 2.5em; font-weight: bold;">🏗️ 3D Floor Plan Converter</h1>
-                        <p style="font-size: 1.1em; margin-top: 15px; opacity: 0.95; font-weight: 300;">
-                            Professional 2D→3D Floor Plan Transformation with Interactive Visualization v2.0
-                        </p>
-                        <p style="font-size: 0.9em; margin-top: 10px; opacity: 0.85;">
-                            ✨ Enhanced with room-based coloring, improved geometry, and better UX
-                        </p>
-                    </div>
-                    """
-                )
+                gr.HTML(_HEADER_HTML)
         
         # Main content area with improved layout
         with gr.Row(equal_height=False):
@@ -479,16 +794,21 @@ def create_interface() -> gr.Blocks:
         
         # Event handlers
         
-        # Template buttons
-        def load_template(template_name: str) -> Tuple[str, str]:
-            file_path, status = generate_template_json(template_name)
-            return file_path, status
-        
-        btn_1bhk.click(fn=lambda: load_template("1bhk"), outputs=[file_input, status_output])
-        btn_2bhk.click(fn=lambda: load_template("2bhk"), outputs=[file_input, status_output])
-        btn_3bhk.click(fn=lambda: load_template("3bhk"), outputs=[file_input, status_output])
-        btn_villa.click(fn=lambda: load_template("villa"), outputs=[file_input, status_output])
-        btn_penthouse.click(fn=lambda: load_template("penthouse"), outputs=[file_input, status_output])
+        # Template buttons share one handler; each passes its template name
+        # through a gr.State input
+        template_buttons = {
+            "1bhk": btn_1bhk,
+            "2bhk": btn_2bhk,
+            "3bhk": btn_3bhk,
+            "villa": btn_villa,
+            "penthouse": btn_penthouse
+        }
+        for template_name, button in template_buttons.items():
+            button.click(
+                fn=generate_template_json,
+                inputs=gr.State(template_name),
+                outputs=[file_input, status_output]
+            )
         
         # Sample file generation
         sample_button.click(
@@ -501,25 +821,91 @@ def create_interface() -> gr.Blocks:
         process_button.click(
             fn=process_floor_plan,
             inputs=[file_input, color_bedroom, color_bathroom, color_kitchen, color_livingroom],
-            outputs=[model_output, status_output, room_details_output, info_output]
+            outputs=[model_output, status_output, room_details_output, info_output],
+            concurrency_limit=_PROCESS_CONCURRENCY
         )
     
     return interface
 
 
+class _GLBGZipMiddleware:
+    """
+    ASGI middleware that gzip-compresses GLB downloads and nothing else.
+    
+    Wrapping the whole Gradio app in GZipMiddleware would also compress its
+    text/event-stream queue, which Starlette before 0.46 buffers until the
+    stream closes, holding back progress and result events. Only requests
+    for paths ending in ".glb" go through the compressor.
+    """
+    
+    def __init__(self, app: Any, minimum_size: int = 1024) -> None:
+        """
+        Wrap an ASGI app.
+        
+        Args:
+            app: The ASGI application to wrap
+            minimum_size: Smallest response body (bytes) worth compressing
+        """
+        # Starlette ships with Gradio (it is the base of Gradio's FastAPI app)
+        from starlette.middleware.gzip import GZipMiddleware
+        
+        self.app = app
+        self.gzip_app = GZipMiddleware(app, minimum_size=minimum_size)
+    
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] == "http" and scope["path"].endswith(".glb"):
+            await self.gzip_app(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+def _warmup() -> None:
+    """
+    Load the geometry stack and compile the optional Numba kernel.
+    
+    Runs in a background thread at startup so the first request does not
+    pay for the trimesh/shapely imports, the GLB exporter setup or JIT
+    compilation.
+    """
+    from builder import HouseBuilder
+    
+    builder = HouseBuilder()
+    builder.export_to_glb_bytes(builder.process_floorplan(SAMPLE_FLOOR_PLAN))
+    
+    # The kernel is only used for very large plans, so call it directly
+    try:
+        from _kernels import wall_corners
+    except ImportError:
+        return
+    
+    import numpy as np
+    
+    wall_corners(
+        np.asarray(SAMPLE_FLOOR_PLAN["walls"], dtype=np.float32),
+        builder.wall_thickness / 2,
+        np.empty((len(SAMPLE_FLOOR_PLAN["walls"]), 4, 2), dtype=np.float32)
+    )
+
+
 def main() -> None:
     """
     Launch the Gradio web application.
     
     Starts the web server and makes the interface accessible via browser.
+    GLB model downloads are gzip-compressed for clients that accept it.
     """
+    from starlette.middleware import Middleware
+    
     interface = create_interface()
     
+    threading.Thread(target=_warmup, name="warmup", daemon=True).start()
+    
     interface.launch(
         server_name="0.0.0.0",  # Allow external connections
         server_port=7860,        # Default Gradio port
         share=False,             # Set to True for public sharing
-        show_error=True          # Display detailed errors in UI
+        show_error=True,         # Display detailed errors in UI
+        app_kwargs={"middleware": [Middleware(_GLBGZipMiddleware, minimum_size=1024)]}
     )
 
 